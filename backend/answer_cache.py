@@ -0,0 +1,74 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class AnswerCache:
+    """
+    LRU cache of generated answers with a time to live
+
+    Entries are keyed on the normalized query, the language and the
+    retrieved chunks, so an answer is only reused while retrieval still
+    returns the same context. Cache hits are served without an LLM call and
+    therefore never wait in, or get shed by, the LLM scheduler. Only used
+    from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_env(cls) -> "AnswerCache":
+        """Create cache configured from ANSWER_CACHE_* environment variables"""
+        return cls(
+            max_size=int(os.getenv("ANSWER_CACHE_SIZE", "1024")),
+            ttl=float(os.getenv("ANSWER_CACHE_TTL", "3600")),
+        )
+
+    @staticmethod
+    def key(query: str, language: str, chunks: List[str]) -> str:
+        normalized = " ".join(query.lower().split())
+        digest = hashlib.sha256()
+        for part in [normalized, language, *chunks]:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, query: str, language: str, chunks: List[str]) -> Optional[str]:
+        """Return a cached answer or None"""
+        if self.max_size <= 0:
+            return None
+        key = self.key(query, language, chunks)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[1]
+
+    def put(self, query: str, language: str, chunks: List[str], answer: str):
+        """Store an answer, evicting the least recently used entry when full"""
+        if self.max_size <= 0:
+            return
+        key = self.key(query, language, chunks)
+        self._entries[key] = (time.monotonic() + self.ttl, answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def metrics(self) -> Dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
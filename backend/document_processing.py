@@ -26,6 +26,27 @@ def clean_text(text: str) -> str:
     text = re.sub(r'[^\w\s.,!?-]', '', text)
     return text.strip()
 
+POLISH_CHARS = set("ąćęłńóśźż")
+POLISH_WORDS = {"i", "w", "z", "na", "się", "jest", "nie", "do", "oraz", "że", "dla", "od", "są", "przez"}
+ENGLISH_WORDS = {"the", "and", "of", "is", "to", "in", "for", "are", "with", "on", "by", "be", "from"}
+
+def detect_language(text: str) -> str:
+    """
+    Guess whether text is Polish or English
+    
+    Args:
+        text: Text to classify
+        
+    Returns:
+        "en" if the text looks English, otherwise "pl"
+    """
+    lowered = text.lower()
+    words = re.findall(r'\w+', lowered)
+    polish_score = sum(word in POLISH_WORDS for word in words)
+    polish_score += 2 * sum(char in POLISH_CHARS for char in lowered)
+    english_score = sum(word in ENGLISH_WORDS for word in words)
+    return "en" if english_score > polish_score else "pl"
+
 def chunk_text(text: str, chunk_size: int = 400, overlap: int = 100) -> List[str]:
     """
     Split text into overlapping chunks
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerRejected(Exception):
+    """Raised when a request is shed instead of being queued for the LLM"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM calls
+
+    At most max_concurrency calls run at once. Further requests wait in
+    per-client queues that are served round-robin, so one noisy client can
+    not starve the others. Requests are shed immediately when the client
+    queue (429) or the global queue (503) is full, and after waiting longer
+    than queue_timeout seconds (503). All state is touched only from the
+    event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_queue: int = 32,
+                 max_queue_per_client: int = 4, queue_timeout: float = 10.0):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_per_client = max_queue_per_client
+        self.queue_timeout = queue_timeout
+
+        self._in_flight = 0
+        self._queued = 0
+        # client id -> waiting futures; order of keys is the round-robin order
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._wait_times: Deque[float] = deque(maxlen=1000)
+        self._service_time = 1.0  # EWMA of successful LLM call duration in seconds
+        self._backoff_until = 0.0  # monotonic time until which the provider asked us to wait
+        self._counters = {
+            "admitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected_client_queue_full": 0,
+            "rejected_queue_full": 0,
+            "rejected_timeout": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        """Create scheduler configured from LLM_* environment variables"""
+        return cls(
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+            max_queue=int(os.getenv("LLM_MAX_QUEUE", "32")),
+            max_queue_per_client=int(os.getenv("LLM_MAX_QUEUE_PER_CLIENT", "4")),
+            queue_timeout=float(os.getenv("LLM_QUEUE_TIMEOUT", "10")),
+        )
+
+    def retry_after(self) -> int:
+        """Estimate in seconds until a newly queued request would be served"""
+        waves = self._queued / self.max_concurrency + 1
+        estimate = math.ceil(waves * self._service_time)
+        backoff = math.ceil(self._backoff_until - time.monotonic())
+        return max(1, estimate, backoff)
+
+    def note_upstream_backoff(self, seconds: float):
+        """Remember a Retry-After sent by the provider so shed requests get it too"""
+        self._backoff_until = max(self._backoff_until, time.monotonic() + seconds)
+
+    def _reject(self, status_code: int, reason: str, client_id: str) -> SchedulerRejected:
+        self._counters[f"rejected_{reason}"] += 1
+        error = SchedulerRejected(status_code, reason, self.retry_after())
+        logger.warning(
+            f"Shedding LLM request from {client_id} ({reason}, queue depth {self._queued}), "
+            f"retry after {error.retry_after}s"
+        )
+        return error
+
+    def _admit(self, waited: float):
+        self._in_flight += 1
+        self._counters["admitted"] += 1
+        self._wait_times.append(waited)
+
+    def _remove_waiter(self, client_id: str, waiter: asyncio.Future):
+        queue = self._queues.get(client_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        self._queued -= 1
+        if not queue:
+            del self._queues[client_id]
+
+    def _dispatch(self):
+        """Hand free slots to waiting requests, one client at a time"""
+        while self._in_flight < self.max_concurrency and self._queues:
+            client_id, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._queues.move_to_end(client_id)
+            else:
+                del self._queues[client_id]
+            if waiter.done():
+                continue
+            # The slot is counted here so it can not be taken twice before
+            # the waiting coroutine resumes
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    async def acquire(self, client_id: str):
+        """Wait for an LLM slot or raise SchedulerRejected"""
+        if self._in_flight < self.max_concurrency and not self._queues:
+            self._admit(0.0)
+            return
+        if self._queued >= self.max_queue:
+            raise self._reject(503, "queue_full", client_id)
+        if len(self._queues.get(client_id, ())) >= self.max_queue_per_client:
+            raise self._reject(429, "client_queue_full", client_id)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(client_id, deque()).append(waiter)
+        self._queued += 1
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                waiter.cancel()
+                self._remove_waiter(client_id, waiter)
+                raise self._reject(503, "timeout", client_id)
+        except asyncio.CancelledError:
+            # Client went away; give back a slot we may already have been handed
+            if waiter.done() and not waiter.cancelled():
+                self._in_flight -= 1
+                self._dispatch()
+            else:
+                waiter.cancel()
+                self._remove_waiter(client_id, waiter)
+            raise
+        # _dispatch already counted the slot in _in_flight
+        self._in_flight -= 1
+        self._admit(time.monotonic() - start)
+
+    def release(self, service_time: Optional[float] = None):
+        """Return an LLM slot and wake the next waiting request"""
+        self._in_flight -= 1
+        self._counters["completed"] += 1
+        if service_time is not None:
+            self._service_time = 0.8 * self._service_time + 0.2 * service_time
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, client_id: str):
+        """
+        Hold an LLM slot for the duration of the block
+
+        The slot is always released. Only blocks that finish without an
+        exception update the service time estimate, so fast failures from
+        an overloaded provider do not shorten Retry-After.
+        """
+        await self.acquire(client_id)
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self._counters["failed"] += 1
+            self.release()
+            raise
+        self.release(time.monotonic() - start)
+
+    def metrics(self) -> Dict:
+        """Snapshot of queue depth, wait times and admission counters"""
+        waits = sorted(self._wait_times)
+
+        def pct(p: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[max(0, math.ceil(p / 100 * len(waits)) - 1)]
+
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self._queued,
+            "max_queue": self.max_queue,
+            "queued_clients": len(self._queues),
+            "wait_ms": {
+                "p50": round(pct(50) * 1000, 2),
+                "p99": round(pct(99) * 1000, 2),
+                "max": round((waits[-1] if waits else 0.0) * 1000, 2),
+            },
+            "service_time_ms": round(self._service_time * 1000, 2),
+            **self._counters,
+        }
@@ -1,6 +1,7 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 import logging
 from typing import List, Optional
@@ -12,7 +13,9 @@ from dotenv import load_dotenv
 import chromadb
 
 from document_processing import process_document
-from vector_store import VectorStore
+from vector_store import VectorStore, LLMUnavailable, ERROR_ANSWERS
+from llm_scheduler import LLMScheduler, SchedulerRejected
+from answer_cache import AnswerCache
 from pydantic import BaseModel
 
 # Configure logging
@@ -25,6 +28,10 @@ logger = logging.getLogger(__name__)
 # Загрузка переменных окружения
 load_dotenv()
 HUGGINGFACE_API_TOKEN = os.getenv("HF_API_TOKEN")
+# X-Client-Id is set by the client itself, so it is only used for fair queuing when enabled
+TRUST_CLIENT_ID_HEADER = os.getenv("LLM_TRUST_CLIENT_ID_HEADER", "0") == "1"
+# Reverse proxies whose X-Forwarded-For header is trusted, comma separated
+TRUSTED_PROXIES = {ip.strip() for ip in os.getenv("LLM_TRUSTED_PROXIES", "").split(",") if ip.strip()}
 
 app = FastAPI(
     title="Chatbot LLM + RAG dla programu studiów",
@@ -57,6 +64,12 @@ class ChatResponse(BaseModel):
 # Initialize vector store
 vector_store = VectorStore()
 
+# Limits concurrent Groq calls across all /chat requests
+llm_scheduler = LLMScheduler.from_env()
+
+# Repeated questions with the same retrieved context skip the LLM queue
+answer_cache = AnswerCache.from_env()
+
 # Генерация ответа через Hugging Face Inference API
 def generate_hf_response(prompt, model="mistralai/Mistral-7B-Instruct-v0.2"):
     url = f"https://api-inference.huggingface.co/models/{model}"
@@ -77,13 +90,40 @@ async def root():
     """Root endpoint to check if API is running"""
     return {"status": "ok", "message": "Chatbot LLM + RAG API is running"}
 
+@app.get("/metrics")
+async def metrics():
+    """LLM scheduler queue depth, wait times, admission counters and answer cache stats"""
+    return {"llm_scheduler": llm_scheduler.metrics(), "answer_cache": answer_cache.metrics()}
+
+def get_client_id(http_request: Request) -> str:
+    """
+    Identify the client for fair queuing
+
+    X-Client-Id is only used with LLM_TRUST_CLIENT_ID_HEADER=1. When the
+    direct peer is one of LLM_TRUSTED_PROXIES, the client is the right-most
+    X-Forwarded-For address that is not itself a trusted proxy. Otherwise
+    the remote address is used.
+    """
+    if TRUST_CLIENT_ID_HEADER:
+        client_id = http_request.headers.get("X-Client-Id")
+        if client_id:
+            return client_id
+    host = http_request.client.host if http_request.client else "anonymous"
+    if host in TRUSTED_PROXIES:
+        forwarded = http_request.headers.get("X-Forwarded-For", "")
+        for address in reversed([a.strip() for a in forwarded.split(",") if a.strip()]):
+            if address not in TRUSTED_PROXIES:
+                return address
+    return host
+
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
     """
     Chat with the LLM using RAG
     
     Args:
         request: ChatRequest containing query and language
+        http_request: Raw request, used to identify the client for the LLM scheduler
         
     Returns:
         ChatResponse containing answer and sources
@@ -96,8 +136,11 @@ async def chat(request: ChatRequest):
                 detail="Language must be either 'pl' or 'en'"
             )
         
-        # Get relevant documents
-        relevant_docs = vector_store.search(request.query)
+        # Get relevant documents. Retrieval is not gated by the LLM scheduler,
+        # so answers that need no LLM call are never queued or shed.
+        relevant_docs = await run_in_threadpool(
+            vector_store.search, request.query, language=request.language
+        )
         
         if not relevant_docs:
             return ChatResponse(
@@ -105,14 +148,42 @@ async def chat(request: ChatRequest):
                 sources=[]
             )
         
+        sources = [doc if isinstance(doc, str) else getattr(doc, 'page_content', str(doc)) for doc in relevant_docs]
+        
+        # Answer repeated questions from the cache without queuing for the LLM
+        cached = answer_cache.get(request.query, request.language, sources)
+        if cached is not None:
+            return ChatResponse(answer=cached, sources=sources)
+        
         # Generate answer using LLM
-        answer = vector_store.generate_answer(request.query, relevant_docs, request.language)
+        async with llm_scheduler.slot(get_client_id(http_request)):
+            answer = await run_in_threadpool(
+                vector_store.generate_answer, request.query, relevant_docs, request.language
+            )
         
-        return ChatResponse(
-            answer=answer,
-            sources=[doc if isinstance(doc, str) else getattr(doc, 'page_content', str(doc)) for doc in relevant_docs]
-        )
+        if answer not in ERROR_ANSWERS.values():
+            answer_cache.put(request.query, request.language, sources, answer)
+        
+        return ChatResponse(answer=answer, sources=sources)
         
+    except SchedulerRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail="Too many requests, please try again later" if e.status_code == 429
+            else "Service is busy, please try again later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except LLMUnavailable as e:
+        logger.warning(f"LLM provider unavailable: {str(e)}")
+        if e.retry_after:
+            llm_scheduler.note_upstream_backoff(e.retry_after)
+        raise HTTPException(
+            status_code=503,
+            detail="Language model is temporarily unavailable, please try again later",
+            headers={"Retry-After": str(e.retry_after or llm_scheduler.retry_after())}
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
         raise HTTPException(
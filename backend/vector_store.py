@@ -1,5 +1,9 @@
+import multiprocessing
 import os
-from typing import List, Dict, Any
+import time
+import uuid
+from operator import itemgetter
+from typing import List, Dict, Any, Optional
 import chromadb
 from sentence_transformers import SentenceTransformer
 import logging
@@ -7,6 +11,7 @@ from dotenv import load_dotenv
 import requests
 import json
 from website_scraper import SANScraper
+from document_processing import detect_language
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -14,37 +19,205 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Collection names for each supported layout, keyed by routing value
+COLLECTION_LAYOUTS = {
+    "single": {"default": "documents"},
+    "language": {"pl": "documents_pl", "en": "documents_en"},
+    "source": {"website": "documents_website", "uploaded_document": "documents_uploaded"},
+}
+
+# ChromaDB copies HNSW parameters into the segment metadata once, when the
+# collection is created, so none of them can be changed without a rebuild
+HNSW_DEFAULTS = {
+    "hnsw:space": "l2",
+    "hnsw:construction_ef": 100,
+    "hnsw:search_ef": 10,
+    "hnsw:M": 16,
+    "hnsw:num_threads": multiprocessing.cpu_count(),
+}
+
+# Answers returned when the LLM call fails for a reason other than provider overload
+ERROR_ANSWERS = {
+    "pl": "Przepraszam, wystąpił błąd podczas generowania odpowiedzi.",
+    "en": "Sorry, an error occurred while generating the answer.",
+}
+
+class LLMUnavailable(Exception):
+    """Raised when the LLM provider is overloaded (429/5xx) or does not answer in time"""
+
+    def __init__(self, message: str, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def _parse_retry_after(value: Optional[str]) -> Optional[int]:
+    """Retry-After in seconds; the HTTP-date form is ignored"""
+    try:
+        return max(1, int(float(value)))
+    except (TypeError, ValueError):
+        return None
+
+def hnsw_metadata_from_env() -> Dict[str, Any]:
+    """
+    Build ChromaDB HNSW collection metadata from environment variables
+
+    Unset parameters are left to ChromaDB defaults
+    (construction_ef=100, search_ef=10, M=16).
+    """
+    metadata: Dict[str, Any] = {"hnsw:space": os.getenv("HNSW_SPACE", "cosine")}
+    for key, env_name in (
+        ("hnsw:construction_ef", "HNSW_CONSTRUCTION_EF"),
+        ("hnsw:search_ef", "HNSW_SEARCH_EF"),
+        ("hnsw:M", "HNSW_M"),
+        ("hnsw:num_threads", "HNSW_NUM_THREADS"),
+    ):
+        value = os.getenv(env_name)
+        if value:
+            metadata[key] = int(value)
+    return metadata
+
 class VectorStore:
-    def __init__(self):
-        """Initialize vector store with ChromaDB and sentence transformer model"""
+    def __init__(self, hnsw_params: Optional[Dict[str, Any]] = None, layout: Optional[str] = None):
+        """
+        Initialize vector store with ChromaDB and sentence transformer model
+
+        Args:
+            hnsw_params: HNSW collection metadata overriding the HNSW_* environment variables
+            layout: Collection layout ("single", "language" or "source"),
+                defaults to the COLLECTION_LAYOUT environment variable
+        """
         try:
             # Initialize ChromaDB
-            self.client = chromadb.PersistentClient(path="chroma_db")
+            self.client = chromadb.PersistentClient(path=os.getenv("CHROMA_DB_PATH", "chroma_db"))
             
-            # Create or get collection
-            self.collection = self.client.get_or_create_collection(
-                name="documents",
-                metadata={"hnsw:space": "cosine"}
-            )
+            self.hnsw_metadata = hnsw_metadata_from_env()
+            self.hnsw_metadata.update(hnsw_params or {})
+            self.layout = layout or os.getenv("COLLECTION_LAYOUT", "single")
+            if self.layout not in COLLECTION_LAYOUTS:
+                raise ValueError(
+                    f"Unknown collection layout '{self.layout}'. "
+                    f"Allowed layouts: {', '.join(COLLECTION_LAYOUTS)}"
+                )
+            
+            # Create or get collections
+            self._warn_orphaned_collections()
+            self.collections = {
+                key: self._get_collection(name)
+                for key, name in COLLECTION_LAYOUTS[self.layout].items()
+            }
+            # Chunk counts per collection, kept up to date by _add_chunks so
+            # searches do not have to ask ChromaDB for them
+            self._counts = {key: collection.count() for key, collection in self.collections.items()}
+            # With the "language" layout, other languages are also searched when the
+            # best requested-language hit is further away than this distance
+            self.language_fallback_distance = float(os.getenv("LANGUAGE_FALLBACK_DISTANCE", "0.6"))
+            self.language_fallbacks = 0
             
             # Initialize sentence transformer
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.model = SentenceTransformer(os.getenv("EMBEDDING_MODEL", 'all-MiniLM-L6-v2'))
             
             # Groq API settings
             self.groq_api_key = os.getenv("GROQ_API_KEY")
             if not self.groq_api_key:
                 raise ValueError("GROQ_API_KEY not found in environment variables")
-            self.groq_api_url = "https://api.groq.com/openai/v1/chat/completions"
+            self.groq_api_url = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
             self.groq_model = os.getenv("GROQ_MODEL", "llama3-8b-8192")  # Можно задать через env
+            # Seconds to wait for connecting to / hearing back from Groq
+            self.llm_call_timeout = float(os.getenv("LLM_CALL_TIMEOUT", "30"))
             
             # Initialize with website data if collection is empty
-            if self.collection.count() == 0:
+            if self.count() == 0:
                 self._initialize_with_website_data()
             
+            # Load indexes and the embedding model before the first query
+            if os.getenv("VECTOR_STORE_WARMUP", "1") != "0":
+                self.warm_up()
+            
         except Exception as e:
             logger.error(f"Error initializing vector store: {str(e)}")
             raise
     
+    def _get_collection(self, name: str):
+        """
+        Get a collection, creating it with the configured HNSW parameters
+
+        An existing collection is opened as is. Passing metadata to
+        get_or_create_collection would overwrite the stored parameters
+        while the index on disk keeps the old ones.
+        """
+        try:
+            collection = self.client.get_collection(name)
+        except ValueError:
+            return self.client.create_collection(name=name, metadata=self.hnsw_metadata)
+        existing = collection.metadata or {}
+        changed = [
+            key for key, value in self.hnsw_metadata.items()
+            if key in HNSW_DEFAULTS and existing.get(key, HNSW_DEFAULTS[key]) != value
+        ]
+        if changed:
+            logger.warning(
+                f"Collection '{name}' was built with different HNSW parameters ({', '.join(changed)}); "
+                f"delete it and re-ingest to apply the new configuration"
+            )
+        return collection
+    
+    def _warn_orphaned_collections(self) -> None:
+        """Warn about non-empty collections that the current layout does not search"""
+        current = set(COLLECTION_LAYOUTS[self.layout].values())
+        known = {name for names in COLLECTION_LAYOUTS.values() for name in names.values()}
+        for collection in self.client.list_collections():
+            if collection.name in known - current and collection.count() > 0:
+                logger.warning(
+                    f"Collection '{collection.name}' ({collection.count()} chunks) is not used by the "
+                    f"'{self.layout}' layout; re-ingest uploaded documents to make them searchable again"
+                )
+    
+    def count(self) -> int:
+        """Total number of chunks across all collections"""
+        return sum(self._counts.values())
+    
+    def warm_up(self, rounds: int = 3) -> None:
+        """
+        Run a few queries against every collection
+
+        ChromaDB loads HNSW indexes from disk lazily, so without this the
+        first user queries after a restart pay for loading the index and
+        initialising the embedding model.
+        """
+        start = time.perf_counter()
+        embedding = self.model.encode("warm up").tolist()
+        for key, collection in self.collections.items():
+            if self._counts[key] == 0:
+                continue
+            for _ in range(rounds):
+                collection.query(query_embeddings=[embedding], n_results=1)
+        logger.info(f"Vector store warm-up finished in {time.perf_counter() - start:.2f}s")
+    
+    def _route(self, chunk: str, source: str) -> str:
+        """Pick the collection key for a chunk according to the layout"""
+        if self.layout == "language":
+            return detect_language(chunk)
+        if self.layout == "source":
+            return source
+        return "default"
+    
+    def _add_chunks(self, chunks: List[str], ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Embed chunks and add them to the collections they are routed to"""
+        embeddings = self.model.encode(chunks).tolist()
+        groups: Dict[str, Dict[str, list]] = {}
+        for chunk, embedding, chunk_id, metadata in zip(chunks, embeddings, ids, metadatas):
+            metadata = {**metadata, 'language': detect_language(chunk)}
+            group = groups.setdefault(
+                self._route(chunk, metadata['source']),
+                {'embeddings': [], 'documents': [], 'ids': [], 'metadatas': []}
+            )
+            group['embeddings'].append(embedding)
+            group['documents'].append(chunk)
+            group['ids'].append(chunk_id)
+            group['metadatas'].append(metadata)
+        for key, group in groups.items():
+            self.collections[key].add(**group)
+            self._counts[key] = self.collections[key].count()
+    
     def _initialize_with_website_data(self):
         """Initialize vector store with data from SAN website"""
         try:
@@ -61,13 +234,9 @@ class VectorStore:
                 # Create chunks from content
                 chunks = self._create_chunks(item['content'])
                 
-                # Generate embeddings
-                embeddings = self.model.encode(chunks)
-                
-                # Add to collection
-                self.collection.add(
-                    embeddings=embeddings.tolist(),
-                    documents=chunks,
+                # Embed and add to collections
+                self._add_chunks(
+                    chunks,
                     ids=[f"website_{item['title']}_{i}" for i in range(len(chunks))],
                     metadatas=[{
                         'source': 'website',
@@ -102,6 +271,9 @@ class VectorStore:
             if chunk:
                 chunks.append(chunk)
             
+            # Stop after the last chunk, otherwise the overlap keeps start below text_length forever
+            if end >= text_length:
+                break
             start = end - overlap
         
         return chunks
@@ -114,14 +286,10 @@ class VectorStore:
             chunks: List of text chunks to add
         """
         try:
-            # Generate embeddings
-            embeddings = self.model.encode(chunks)
-            
-            # Add to collection
-            self.collection.add(
-                embeddings=embeddings.tolist(),
-                documents=chunks,
-                ids=[f"doc_{i}" for i in range(len(chunks))],
+            # Embed and add to collections
+            self._add_chunks(
+                chunks,
+                ids=[f"doc_{uuid.uuid4().hex}" for _ in chunks],
                 metadatas=[{'source': 'uploaded_document'} for _ in chunks]
             )
             
@@ -131,17 +299,42 @@ class VectorStore:
             logger.error(f"Error adding documents to vector store: {str(e)}")
             raise
     
-    def search(self, query: str, top_k: int = 1) -> list:
+    def _query_collections(self, keys: List[str], embedding: list, top_k: int) -> List[tuple]:
+        """Query several collections and return (distance, document) pairs"""
+        hits = []
+        for key in keys:
+            available = self._counts[key]
+            if available == 0:
+                continue
+            results = self.collections[key].query(query_embeddings=[embedding], n_results=min(top_k, available))
+            hits.extend(zip(results["distances"][0], results["documents"][0]))
+        return hits
+    
+    def search(self, query: str, top_k: int = 1, language: Optional[str] = None) -> list:
         """
         Search for relevant documents
+
+        With the "language" layout the collection matching the requested
+        language is searched first. Requested-language hits within
+        LANGUAGE_FALLBACK_DISTANCE always come first; the remaining results
+        are filled from the more distant requested-language hits and the
+        other collections, merged by distance. Other layouts search all
+        collections and merge results by distance.
         """
         try:
-            query_embedding = self.model.encode(query)
-            results = self.collection.query(
-                query_embeddings=[query_embedding.tolist()],
-                n_results=top_k
-            )
-            return results["documents"][0]
+            query_embedding = self.model.encode(query).tolist()
+            by_distance = itemgetter(0)
+            if self.layout == "language" and language in self.collections:
+                primary = sorted(self._query_collections([language], query_embedding, top_k), key=by_distance)
+                hits = [hit for hit in primary if hit[0] <= self.language_fallback_distance]
+                if len(hits) < top_k:
+                    self.language_fallbacks += 1
+                    others = [key for key in self.collections if key != language]
+                    fallback = primary[len(hits):] + self._query_collections(others, query_embedding, top_k)
+                    hits.extend(sorted(fallback, key=by_distance)[:top_k - len(hits)])
+            else:
+                hits = sorted(self._query_collections(list(self.collections), query_embedding, top_k), key=by_distance)
+            return [document for _, document in hits[:top_k]]
         except Exception as e:
             logger.error(f"Error searching vector store: {str(e)}")
             raise
@@ -149,6 +342,11 @@ class VectorStore:
     def generate_answer(self, query: str, context: list, language: str = "pl") -> str:
         """
         Generate answer using Groq API (OpenAI-compatible)
+
+        Raises:
+            LLMUnavailable: Groq answered 429/5xx or did not answer within
+                LLM_CALL_TIMEOUT seconds. Other errors return an apology
+                from ERROR_ANSWERS.
         """
         try:
             if language == "pl":
@@ -185,7 +383,18 @@ class VectorStore:
                 "max_tokens": 512,
                 "temperature": 0.7
             }
-            response = requests.post(self.groq_api_url, headers=headers, json=payload)
+            try:
+                response = requests.post(
+                    self.groq_api_url, headers=headers, json=payload, timeout=self.llm_call_timeout
+                )
+            except requests.Timeout as e:
+                raise LLMUnavailable(f"Groq API did not answer within {self.llm_call_timeout}s: {e}")
+            if response.status_code == 429 or response.status_code >= 500:
+                logger.error(f"Groq API unavailable {response.status_code}: {response.text}")
+                raise LLMUnavailable(
+                    f"Groq API returned {response.status_code}",
+                    retry_after=_parse_retry_after(response.headers.get("Retry-After"))
+                )
             if response.status_code != 200:
                 logger.error(f"Groq API error {response.status_code}: {response.text}")
                 raise Exception(f"API request failed with status {response.status_code}: {response.text}")
@@ -196,9 +405,8 @@ class VectorStore:
             if answer.strip() == context_text.strip() or len(answer.strip()) < 5:
                 return idk
             return answer
+        except LLMUnavailable:
+            raise
         except Exception as e:
             logger.error(f"Error generating answer: {str(e)}")
-            if language == "pl":
-                return "Przepraszam, wystąpił błąd podczas generowania odpowiedzi."
-            else:
-                return "Sorry, an error occurred while generating the answer." 
\ No newline at end of file
+            return ERROR_ANSWERS["pl" if language == "pl" else "en"] 
\ No newline at end of file
@@ -1,3 +1,4 @@
+import os
 import requests
 from bs4 import BeautifulSoup
 import logging
@@ -8,7 +9,7 @@ logger = logging.getLogger(__name__)
 
 class SANScraper:
     def __init__(self):
-        self.base_url = "https://san.edu.pl"
+        self.base_url = os.getenv("SAN_BASE_URL", "https://san.edu.pl")
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
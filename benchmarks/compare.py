@@ -0,0 +1,77 @@
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+
+def load(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> Tuple[List[Tuple], List[str], List[str]]:
+    """
+    Compare two benchmark result files
+
+    Args:
+        baseline: Results of the reference commit
+        current: Results of the commit under test
+        threshold: Allowed relative slowdown, e.g. 0.1 for 10%
+
+    Returns:
+        Tuple of (rows for the report, names of regressed metrics,
+        names of baseline metrics missing from the current run)
+    """
+    rows, regressions = [], []
+    base_metrics = baseline["metrics"]
+    # A stage that crashed or was renamed must not pass as "no regression"
+    missing = sorted(set(base_metrics) - set(current["metrics"]))
+    for name, metric in sorted(current["metrics"].items()):
+        if name not in base_metrics:
+            continue
+        old, new = base_metrics[name]["value"], metric["value"]
+        if old == 0:
+            change = 0.0 if new == 0 else float("inf")
+        else:
+            change = (new - old) / abs(old)
+        # Positive "worse" means the metric moved in the wrong direction
+        worse = -change if metric["higher_is_better"] else change
+        regressed = worse > threshold
+        if regressed:
+            regressions.append(name)
+        rows.append((name, old, new, metric["unit"], change, regressed))
+    return rows, regressions, missing
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative change treated as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    baseline, current = load(args.baseline), load(args.current)
+    rows, regressions, missing = compare(baseline, current, args.threshold)
+
+    print(f"baseline: {baseline['meta'].get('commit')}  current: {current['meta'].get('commit')}")
+    print(f"{'metric':<40} {'baseline':>12} {'current':>12} {'unit':>10} {'change':>9}")
+    for name, old, new, unit, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<40} {old:>12.3f} {new:>12.3f} {unit:>10} {change:>+8.1%}{flag}")
+
+    for name in missing:
+        print(f"{name:<40} {baseline['metrics'][name]['value']:>12.3f} {'-':>12} {'':>10} {'':>9}  MISSING")
+
+    failed = False
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        failed = True
+    if missing:
+        print(f"\n{len(missing)} baseline metric(s) missing from the current run")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+import csv
+import io
+import random
+from typing import Any, Dict, List, Tuple
+
+# Vocabulary for the deterministic fixture corpus
+SUBJECTS = [
+    "Programming Fundamentals", "Discrete Mathematics", "Databases", "Computer Networks",
+    "Operating Systems", "Software Engineering", "Machine Learning", "Computer Graphics",
+    "Algorithms and Data Structures", "Information Security", "Web Applications",
+    "Distributed Systems", "Linear Algebra", "Statistics", "Project Management",
+]
+LECTURERS = [
+    "dr Anna Nowak", "dr hab. Piotr Kowalski", "prof. Maria Wisniewska", "dr Tomasz Wojcik",
+    "mgr Katarzyna Kaminska", "dr Pawel Lewandowski", "dr Ewa Zielinska",
+]
+FORMS = ["lecture", "laboratory", "seminar", "project", "exercises"]
+ASSESSMENTS = ["written exam", "oral exam", "project defence", "graded test", "coursework"]
+PROGRAMS = [
+    "Computer Science", "Management", "Logistics", "Psychology", "Graphic Design",
+    "International Relations", "Finance and Accounting", "Cybersecurity",
+]
+TEMPLATES = [
+    "{subject} is taught in semester {semester} and is worth {ects} ECTS points.",
+    "The {form} in {subject} is led by {lecturer} and ends with a {assessment}.",
+    "Students of {program} attend {subject} for {hours} hours in semester {semester}.",
+    "To pass {subject} students must complete a {assessment} with at least {score} percent.",
+    "{lecturer} holds office hours for {subject} every week after the {form}.",
+]
+
+# Polish vocabulary, the real university website is in Polish
+SUBJECTS_PL = [
+    "Podstawy programowania", "Matematyka dyskretna", "Bazy danych", "Sieci komputerowe",
+    "Systemy operacyjne", "Inżynieria oprogramowania", "Uczenie maszynowe", "Grafika komputerowa",
+    "Algorytmy i struktury danych", "Bezpieczeństwo informacji", "Aplikacje internetowe",
+    "Systemy rozproszone", "Algebra liniowa", "Statystyka", "Zarządzanie projektami",
+]
+FORMS_PL = ["wykład", "laboratorium", "seminarium", "projekt", "ćwiczenia"]
+ASSESSMENTS_PL = ["egzamin pisemny", "egzamin ustny", "obrona projektu", "kolokwium", "zaliczenie na ocenę"]
+PROGRAMS_PL = [
+    "Informatyka", "Zarządzanie", "Logistyka", "Psychologia", "Grafika",
+    "Stosunki międzynarodowe", "Finanse i rachunkowość", "Cyberbezpieczeństwo",
+]
+TEMPLATES_PL = [
+    "Przedmiot {subject} jest realizowany na {semester} semestrze i ma {ects} punktów ECTS.",
+    "Zajęcia {subject} w formie {form} prowadzi {lecturer}, a kończy je {assessment}.",
+    "Studenci kierunku {program} mają {subject} przez {hours} godzin na {semester} semestrze.",
+    "Aby zaliczyć {subject}, student musi uzyskać co najmniej {score} procent z formy {assessment}.",
+    "{lecturer} ma dyżur dla studentów przedmiotu {subject} w każdym tygodniu po zajęciach.",
+]
+
+VOCABULARY = {
+    "en": (SUBJECTS, FORMS, ASSESSMENTS, PROGRAMS, TEMPLATES),
+    "pl": (SUBJECTS_PL, FORMS_PL, ASSESSMENTS_PL, PROGRAMS_PL, TEMPLATES_PL),
+}
+
+
+def _sentence(rng: random.Random, language: str = "en") -> str:
+    """Build a single syllabus-like sentence"""
+    subjects, forms, assessments, programs, templates = VOCABULARY[language]
+    subject = rng.choice(subjects)
+    return rng.choice(templates).format(
+        subject=subject,
+        semester=rng.randint(1, 7),
+        ects=rng.randint(2, 8),
+        form=rng.choice(forms),
+        lecturer=rng.choice(LECTURERS),
+        assessment=rng.choice(assessments),
+        program=rng.choice(programs),
+        hours=rng.choice([15, 30, 45, 60]),
+        score=rng.choice([50, 51, 60]),
+    )
+
+
+def make_paragraphs(rng: random.Random, count: int, sentences: int = 6, language: str = "en") -> List[str]:
+    """Generate paragraphs of syllabus-like text"""
+    return [" ".join(_sentence(rng, language) for _ in range(sentences)) for _ in range(count)]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """
+    Build a minimal text PDF without external dependencies
+
+    Args:
+        pages: List of pages, each a list of text lines (ASCII)
+
+    Returns:
+        PDF file content as bytes
+    """
+    objects = []
+    page_ids = []
+    # 1: catalog, 2: pages, 3: font, then page/content pairs
+    font_id = 3
+    next_id = 4
+    page_objects = []
+    for lines in pages:
+        stream_lines = ["BT", "/F1 10 Tf", "14 TL", "50 790 Td"]
+        for line in lines:
+            stream_lines.append(f"({_pdf_escape(line)}) Tj T*")
+        stream_lines.append("ET")
+        stream = "\n".join(stream_lines).encode("latin-1")
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        page_objects.append((page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("latin-1")))
+        page_objects.append((content_id, b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"))
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append((1, b"<< /Type /Catalog /Pages 2 0 R >>"))
+    objects.append((2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1")))
+    objects.append((font_id, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"))
+    objects.extend(page_objects)
+    objects.sort()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id, body in objects:
+        offsets[obj_id] = out.tell()
+        out.write(b"%d 0 obj\n" % obj_id + body + b"\nendobj\n")
+    xref_offset = out.tell()
+    out.write(b"xref\n0 %d\n" % (len(objects) + 1))
+    out.write(b"0000000000 65535 f \n")
+    for obj_id, _ in objects:
+        out.write(b"%010d 00000 n \n" % offsets[obj_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return out.getvalue()
+
+
+def _wrap(text: str, width: int = 90) -> List[str]:
+    """Wrap text into lines that fit on a PDF page"""
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    if current:
+        lines.append(current)
+    return lines
+
+
+def make_pdf(rng: random.Random, pages: int = 3) -> bytes:
+    """Generate a syllabus PDF"""
+    content = []
+    for _ in range(pages):
+        lines = []
+        for paragraph in make_paragraphs(rng, 4):
+            lines.extend(_wrap(paragraph))
+            lines.append("")
+        content.append(lines[:50])
+    return build_pdf(content)
+
+
+def make_csv(rng: random.Random, rows: int = 60) -> bytes:
+    """Generate a study plan CSV"""
+    fields = ["subject", "semester", "ects", "form", "hours", "lecturer", "assessment"]
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows({
+        "subject": rng.choice(SUBJECTS),
+        "semester": rng.randint(1, 7),
+        "ects": rng.randint(2, 8),
+        "form": rng.choice(FORMS),
+        "hours": rng.choice([15, 30, 45, 60]),
+        "lecturer": rng.choice(LECTURERS),
+        "assessment": rng.choice(ASSESSMENTS),
+    } for _ in range(rows))
+    return out.getvalue().encode("utf-8")
+
+
+def make_html(rng: random.Random, title: str, sections: int = 4, language: str = "en") -> bytes:
+    """Generate a program description HTML page"""
+    part = "część" if language == "pl" else "part"
+    body = "".join(
+        f"<section><h2>{title} - {part} {i + 1}</h2><p>{paragraph}</p></section>"
+        for i, paragraph in enumerate(make_paragraphs(rng, sections, language=language))
+    )
+    return (
+        f"<html><head><title>{title}</title><style>p {{ margin: 0; }}</style></head>"
+        f"<body><nav><a href=\"/\">Home</a></nav><main>{body}</main>"
+        f"<footer>SAN</footer><script>var x = 1;</script></body></html>"
+    ).encode("utf-8")
+
+
+def build_corpus(num_docs: int = 30, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Build a deterministic fixture corpus of PDF, CSV and HTML documents
+
+    Args:
+        num_docs: Number of documents to generate
+        seed: Random seed, the same seed always gives the same corpus
+
+    Returns:
+        List of dicts with name, file_type, content_type and content
+    """
+    rng = random.Random(seed)
+    kinds = [
+        ("pdf", "application/pdf", lambda i: make_pdf(rng)),
+        ("csv", "text/csv", lambda i: make_csv(rng)),
+        ("html", "text/html", lambda i: make_html(rng, f"{rng.choice(PROGRAMS)} {i}")),
+    ]
+    corpus = []
+    for i in range(num_docs):
+        file_type, content_type, factory = kinds[i % len(kinds)]
+        corpus.append({
+            "name": f"fixture_{i:03d}.{file_type}",
+            "file_type": file_type,
+            "content_type": content_type,
+            "content": factory(i),
+        })
+    return corpus
+
+
+def build_queries(num_queries: int = 50, seed: int = 7) -> List[str]:
+    """Generate deterministic user questions about the corpus"""
+    rng = random.Random(seed)
+    templates = [
+        "How many ECTS points is {subject} worth?",
+        "Who teaches {subject}?",
+        "In which semester is {subject}?",
+        "How is {subject} assessed?",
+        "What subjects are in semester {semester} of {program}?",
+    ]
+    return [
+        rng.choice(templates).format(
+            subject=rng.choice(SUBJECTS),
+            semester=rng.randint(1, 7),
+            program=rng.choice(PROGRAMS),
+        )
+        for _ in range(num_queries)
+    ]
+
+
+def build_site_pages(num_programs: int = 5, seed: int = 3,
+                     english_programs: int = 1) -> Tuple[bytes, Dict[str, bytes]]:
+    """
+    Build pages for the stub university website
+
+    Like the real website the pages are in Polish, except for the last
+    english_programs program pages, which stand in for English-taught
+    programs.
+
+    Returns:
+        Tuple of (main page HTML, mapping of program path to program page HTML)
+    """
+    rng = random.Random(seed)
+    programs = {}
+    links = []
+    for i in range(num_programs):
+        language = "en" if i >= num_programs - english_programs else "pl"
+        name = PROGRAMS[i] if language == "en" else PROGRAMS_PL[i]
+        # Paths stay ASCII, like the slugs on the real website
+        path = f"/studia/{PROGRAMS[i].lower().replace(' ', '-')}"
+        programs[path] = make_html(rng, name, language=language)
+        links.append(f"<a href=\"{path}\">{name}</a>")
+    sections = "".join(
+        f"<section><h2>Informacje ogólne {i + 1}</h2><p>{paragraph}</p></section>"
+        for i, paragraph in enumerate(make_paragraphs(rng, 3, language="pl"))
+    )
+    main_page = (
+        f"<html><body><header>SAN</header><nav>{''.join(links)}</nav>"
+        f"{sections}<footer>SAN</footer></body></html>"
+    ).encode("utf-8")
+    return main_page, programs
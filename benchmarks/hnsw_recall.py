@@ -0,0 +1,145 @@
+import argparse
+import json
+import logging
+import os
+import time
+from typing import Iterator, List, Tuple
+
+import hnswlib
+import numpy as np
+
+from benchmarks.run_benchmarks import ROOT_DIR, Results, peak_rss_mb
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 50_000
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(x) for x in value.split(",")]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_centers(dim: int, num_clusters: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((num_clusters, dim)).astype(np.float32)
+
+
+def iter_blocks(size: int, centers: np.ndarray, seed: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield (offset, vectors) blocks of a clustered synthetic dataset
+
+    Each block is generated from its own seed, so the dataset can be
+    replayed for the exact search without holding it all in memory.
+    """
+    for block, offset in enumerate(range(0, size, BLOCK_SIZE)):
+        count = min(BLOCK_SIZE, size - offset)
+        rng = np.random.default_rng((seed, block))
+        labels = rng.integers(0, len(centers), count)
+        vectors = centers[labels] + 0.6 * rng.standard_normal((count, centers.shape[1])).astype(np.float32)
+        yield offset, _normalize(vectors)
+
+
+def make_queries(num_queries: int, centers: np.ndarray, seed: int) -> np.ndarray:
+    # Separate stream from the dataset blocks, which use (seed, block)
+    rng = np.random.default_rng((seed, 1_000_000))
+    labels = rng.integers(0, len(centers), num_queries)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((num_queries, centers.shape[1])).astype(np.float32)
+    return _normalize(vectors)
+
+
+def exact_neighbours(size: int, centers: np.ndarray, queries: np.ndarray, k: int, seed: int) -> np.ndarray:
+    """Brute-force top-k ids by cosine similarity"""
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(queries), k), dtype=np.int64)
+    for offset, vectors in iter_blocks(size, centers, seed):
+        scores = queries @ vectors.T
+        ids = np.broadcast_to(np.arange(offset, offset + len(vectors)), scores.shape)
+        all_scores = np.concatenate([best_scores, scores], axis=1)
+        all_ids = np.concatenate([best_ids, ids], axis=1)
+        top = np.argpartition(-all_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(all_scores, top, axis=1)
+        best_ids = np.take_along_axis(all_ids, top, axis=1)
+    return best_ids
+
+
+def build_index(size: int, centers: np.ndarray, seed: int, m: int, construction_ef: int,
+                space: str, num_threads: int) -> hnswlib.Index:
+    index = hnswlib.Index(space=space, dim=centers.shape[1])
+    index.init_index(max_elements=size, ef_construction=construction_ef, M=m, random_seed=seed)
+    index.set_num_threads(num_threads)
+    for offset, vectors in iter_blocks(size, centers, seed):
+        index.add_items(vectors, np.arange(offset, offset + len(vectors)))
+    return index
+
+
+def run(args: argparse.Namespace) -> dict:
+    results = Results(args)
+    centers = make_centers(args.dim, args.clusters, args.seed)
+    queries = make_queries(args.num_queries, centers, args.seed)
+
+    for size in args.sizes:
+        start = time.perf_counter()
+        truth = exact_neighbours(size, centers, queries, args.k, args.seed)
+        logger.info(f"Exact search for {size} vectors took {time.perf_counter() - start:.1f}s")
+
+        for m in args.m:
+            for construction_ef in args.construction_ef:
+                start = time.perf_counter()
+                index = build_index(size, centers, args.seed, m, construction_ef, args.space, args.build_threads)
+                prefix = f"hnsw.n{size}.M{m}.cef{construction_ef}"
+                results.add(f"{prefix}.build_s", time.perf_counter() - start, "s")
+                # Chroma serves each query on a single thread
+                index.set_num_threads(1)
+
+                for search_ef in args.search_ef:
+                    index.set_ef(max(search_ef, args.k))
+                    latencies, found = [], 0
+                    for query, expected in zip(queries, truth):
+                        start = time.perf_counter()
+                        labels, _ = index.knn_query(query, k=args.k)
+                        latencies.append(time.perf_counter() - start)
+                        found += len(set(labels[0].tolist()) & set(expected.tolist()))
+                    results.add(f"{prefix}.ef{search_ef}.recall", found / truth.size, "ratio",
+                                higher_is_better=True)
+                    results.add_latencies(f"{prefix}.ef{search_ef}", latencies)
+                del index
+        results.add(f"memory.n{size}.peak_rss_mb", peak_rss_mb() or 0.0, "MB")
+    return results.to_dict()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="HNSW recall vs latency sweep over the parameters exposed by VectorStore"
+    )
+    parser.add_argument("--sizes", type=_int_list, default=[10_000, 100_000, 1_000_000],
+                        help="Comma separated numbers of chunks")
+    parser.add_argument("--m", type=_int_list, default=[16, 32], help="Values of hnsw:M")
+    parser.add_argument("--construction-ef", type=_int_list, default=[100, 200],
+                        help="Values of hnsw:construction_ef")
+    parser.add_argument("--search-ef", type=_int_list, default=[10, 50, 100, 200],
+                        help="Values of hnsw:search_ef")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query for recall@k")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding size (all-MiniLM-L6-v2 is 384)")
+    parser.add_argument("--clusters", type=int, default=200, help="Topic clusters in the synthetic data")
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--space", default="cosine", choices=["cosine", "l2", "ip"])
+    parser.add_argument("--build-threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=os.path.join(ROOT_DIR, "benchmarks", "results", "hnsw_recall.json"))
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = parse_args()
+    data = run(args)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(data, f, indent=2)
+    logger.info(f"Results written to {args.output}")
@@ -0,0 +1,279 @@
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks.fixtures import build_corpus, build_queries
+from benchmarks.servers import MockLLMServer, StubSiteServer
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT_DIR, "backend")
+RESULTS_VERSION = 1
+# Below this many samples a nearest-rank p99 is just the maximum, i.e. noise
+MIN_P99_SAMPLES = 100
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile, 0.0 for an empty list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Results:
+    """Collects metrics in the machine-readable format read by compare.py"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.meta = {
+            "version": RESULTS_VERSION,
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(args),
+        }
+        self.metrics: Dict[str, Dict] = {}
+
+    def add(self, name: str, value: float, unit: str, higher_is_better: bool = False):
+        self.metrics[name] = {
+            "value": round(value, 4),
+            "unit": unit,
+            "higher_is_better": higher_is_better,
+        }
+        logger.info(f"{name}: {value:.3f} {unit}")
+
+    def add_latencies(self, prefix: str, latencies: List[float]):
+        self.add(f"{prefix}.p50_ms", percentile(latencies, 50) * 1000, "ms")
+        if len(latencies) < MIN_P99_SAMPLES:
+            logger.warning(f"{prefix}: only {len(latencies)} samples, skipping p99")
+            return
+        self.add(f"{prefix}.p99_ms", percentile(latencies, 99) * 1000, "ms")
+
+    def to_dict(self) -> Dict:
+        return {"meta": self.meta, "metrics": self.metrics}
+
+
+def bench_ingestion(results: Results, vector_store, process_document, corpus: List[Dict]):
+    """Measure document processing + embedding + insert throughput"""
+    total_bytes = sum(len(doc["content"]) for doc in corpus)
+    total_chunks = 0
+    start = time.perf_counter()
+    for doc in corpus:
+        chunks = process_document(doc["content"], doc["file_type"])
+        vector_store.add_documents(chunks)
+        total_chunks += len(chunks)
+    elapsed = time.perf_counter() - start
+
+    results.add("ingestion.seconds", elapsed, "s")
+    results.add("ingestion.docs_per_s", len(corpus) / elapsed, "docs/s", higher_is_better=True)
+    results.add("ingestion.chunks_per_s", total_chunks / elapsed, "chunks/s", higher_is_better=True)
+    results.add("ingestion.mb_per_s", total_bytes / elapsed / (1024 * 1024), "MB/s", higher_is_better=True)
+    results.add("memory.after_ingestion_peak_rss_mb", peak_rss_mb() or 0.0, "MB")
+
+
+def bench_retrieval(results: Results, vector_store, queries: List[str], rounds: int,
+                    prefix: str = "retrieval"):
+    """Measure embedding + vector search latency in process"""
+    # Warm up the embedding model and the index before measuring
+    vector_store.search(queries[0], language="en")
+    fallbacks_before = vector_store.language_fallbacks
+    latencies = []
+    for _ in range(rounds):
+        for query in queries:
+            start = time.perf_counter()
+            vector_store.search(query, language="en")
+            latencies.append(time.perf_counter() - start)
+    results.add_latencies(prefix, latencies)
+    # Share of searches that also queried other languages ("language" layout only)
+    results.add(f"{prefix}.language_fallback_ratio",
+                (vector_store.language_fallbacks - fallbacks_before) / len(latencies), "ratio")
+
+
+def _run_uvicorn(app, port: int):
+    import uvicorn
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("uvicorn failed to start")
+        time.sleep(0.05)
+    return server, thread
+
+
+def bench_chat(results: Results, app, queries: List[str], concurrency_levels: List[int],
+               requests_per_level: int, llm: MockLLMServer):
+    """Measure end-to-end /chat latency over real HTTP under concurrency"""
+    port = free_port()
+    server, thread = _run_uvicorn(app, port)
+    url = f"http://127.0.0.1:{port}/chat"
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=max(concurrency_levels)))
+
+    def call(query: str):
+        # Each worker is a separate client, otherwise the per-client queue
+        # limit of the LLM scheduler would shed most of the load
+        headers = {"X-Client-Id": threading.current_thread().name}
+        start = time.perf_counter()
+        try:
+            response = session.post(url, json={"query": query, "language": "en"},
+                                    headers=headers, timeout=300)
+            status = response.status_code
+        except requests.RequestException:
+            status = None
+        return time.perf_counter() - start, status
+
+    try:
+        for level in concurrency_levels:
+            llm_before = llm.stats()["requests"]
+            batch = [queries[i % len(queries)] for i in range(requests_per_level)]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=level) as pool:
+                outcomes = list(pool.map(call, batch))
+            elapsed = time.perf_counter() - start
+
+            latencies = [latency for latency, status in outcomes if status == 200]
+            shed = sum(1 for _, status in outcomes if status in (429, 503))
+            errors = sum(1 for _, status in outcomes if status != 200) - shed
+            prefix = f"chat.c{level}"
+            results.add_latencies(prefix, latencies)
+            results.add(f"{prefix}.rps", len(latencies) / elapsed, "req/s", higher_is_better=True)
+            results.add(f"{prefix}.error_rate", errors / len(outcomes), "ratio")
+            results.add(f"{prefix}.shed_rate", shed / len(outcomes), "ratio")
+            results.add(f"{prefix}.llm_calls", llm.stats()["requests"] - llm_before, "calls")
+        results.add("chat.llm_max_in_flight", llm.stats()["max_in_flight"], "calls")
+        metrics = session.get(f"http://127.0.0.1:{port}/metrics", timeout=10).json()
+        results.add("chat.scheduler_wait_p99_ms", metrics["llm_scheduler"]["wait_ms"]["p99"], "ms")
+        results.add("chat.answer_cache_hits", metrics["answer_cache"]["hits"], "requests")
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+def run(args: argparse.Namespace) -> Dict:
+    results = Results(args)
+    corpus = build_corpus(args.docs, args.seed)
+    queries = build_queries(args.queries, args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="bench_chroma_") as chroma_dir, \
+            MockLLMServer(args.llm_latency, args.llm_jitter, seed=args.seed) as llm, \
+            StubSiteServer(seed=args.seed) as site:
+        os.environ.update({
+            "GROQ_API_KEY": "benchmark",
+            "GROQ_API_URL": llm.completions_url,
+            "SAN_BASE_URL": site.url,
+            "CHROMA_DB_PATH": chroma_dir,
+            "COLLECTION_LAYOUT": args.layout,
+            "LLM_MAX_CONCURRENCY": str(args.llm_max_concurrency),
+            "LLM_MAX_QUEUE": str(args.llm_max_queue),
+            "LLM_MAX_QUEUE_PER_CLIENT": str(args.llm_max_queue_per_client),
+            "LLM_QUEUE_TIMEOUT": str(args.llm_queue_timeout),
+            # Workers identify themselves with X-Client-Id
+            "LLM_TRUST_CLIENT_ID_HEADER": "1",
+            "ANSWER_CACHE_SIZE": str(args.answer_cache_size),
+        })
+        if BACKEND_DIR not in sys.path:
+            sys.path.insert(0, BACKEND_DIR)
+
+        # Importing main builds the VectorStore, which scrapes the stub site
+        start = time.perf_counter()
+        import main as backend_main
+        results.add("startup.seconds", time.perf_counter() - start, "s")
+        results.add("startup.website_chunks", backend_main.vector_store.count(), "chunks")
+        logging.getLogger().setLevel(logging.WARNING)
+        logger.setLevel(logging.INFO)
+
+        # The stub website is mostly Polish, so English queries against it
+        # exercise the language fallback of the "language" layout
+        bench_retrieval(results, backend_main.vector_store, queries, args.retrieval_rounds,
+                        prefix="retrieval.website")
+        bench_ingestion(results, backend_main.vector_store, backend_main.process_document, corpus)
+        bench_retrieval(results, backend_main.vector_store, queries, args.retrieval_rounds)
+        bench_chat(results, backend_main.app, queries, args.concurrency,
+                   args.requests_per_level, llm)
+
+    results.add("memory.peak_rss_mb", peak_rss_mb() or 0.0, "MB")
+    return results.to_dict()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline performance benchmarks for the chatbot backend")
+    parser.add_argument("--docs", type=int, default=30, help="Number of fixture documents to ingest")
+    parser.add_argument("--queries", type=int, default=50, help="Number of distinct queries")
+    parser.add_argument("--retrieval-rounds", type=int, default=3, help="Passes over the queries for retrieval")
+    parser.add_argument("--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[1, 8, 32],
+                        help="Comma separated /chat concurrency levels")
+    parser.add_argument("--requests-per-level", type=int, default=400,
+                        help=f"/chat requests per concurrency level (p99 needs at least {MIN_P99_SAMPLES})")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Mock LLM base latency in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.05, help="Mock LLM extra random latency in seconds")
+    parser.add_argument("--llm-max-concurrency", type=int, default=4, help="LLM_MAX_CONCURRENCY for the run")
+    parser.add_argument("--llm-max-queue", type=int, default=32, help="LLM_MAX_QUEUE for the run")
+    parser.add_argument("--llm-max-queue-per-client", type=int, default=4,
+                        help="LLM_MAX_QUEUE_PER_CLIENT for the run")
+    parser.add_argument("--llm-queue-timeout", type=float, default=10.0, help="LLM_QUEUE_TIMEOUT for the run")
+    parser.add_argument("--answer-cache-size", type=int, default=0,
+                        help="ANSWER_CACHE_SIZE for the run; 0 keeps every /chat request on the LLM path")
+    parser.add_argument("--layout", default="single", choices=["single", "language", "source"],
+                        help="Vector store collection layout")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=os.path.join(ROOT_DIR, "benchmarks", "results", "latest.json"))
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = parse_args()
+    data = run(args)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(data, f, indent=2)
+    logger.info(f"Results written to {args.output}")
@@ -0,0 +1,199 @@
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from benchmarks.fixtures import build_site_pages
+
+logger = logging.getLogger(__name__)
+
+
+class _BackgroundServer:
+    """Run a ThreadingHTTPServer in a daemon thread"""
+
+    def __init__(self, handler_class, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), handler_class)
+        self.httpd.daemon_threads = True
+        self.httpd.owner = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _MockLLMHandler(_QuietHandler):
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.server.owner.stats())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        status, response, headers = self.server.owner.complete(payload)
+        self._send_json(status, response, headers)
+
+
+class MockLLMServer(_BackgroundServer):
+    """
+    Local OpenAI-compatible chat completions server with configurable latency
+
+    Answers are deterministic and derived from the last user message, so
+    results do not depend on a real model or on network access.
+    """
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0, host: str = "127.0.0.1", port: int = 0,
+                 retry_after: Optional[int] = None):
+        super().__init__(_MockLLMHandler, host, port)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        # Sent as Retry-After on simulated 429 responses
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._max_in_flight = 0
+
+    @property
+    def completions_url(self) -> str:
+        return f"{self.url}/openai/v1/chat/completions"
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "errors": self._errors,
+                "in_flight": self._in_flight,
+                "max_in_flight": self._max_in_flight,
+            }
+
+    def complete(self, payload: Dict):
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            failed = self._rng.random() < self.error_rate
+        try:
+            time.sleep(delay)
+            if failed:
+                with self._lock:
+                    self._errors += 1
+                headers = {"Retry-After": str(self.retry_after)} if self.retry_after else {}
+                return 429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}}, headers
+            messages = payload.get("messages", [])
+            question = messages[-1]["content"] if messages else ""
+            answer = f"Mock answer based on the provided context. {question[:200]}"
+            return 200, {
+                "id": f"chatcmpl-mock-{self._requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "mock"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": answer},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }, {}
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+class _StubSiteHandler(_QuietHandler):
+    def do_GET(self):
+        pages = self.server.owner.pages
+        body = pages.get(self.path.rstrip("/") or "/")
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubSiteServer(_BackgroundServer):
+    """Static stand-in for the university website used by SANScraper"""
+
+    def __init__(self, num_programs: int = 5, seed: int = 3, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(_StubSiteHandler, host, port)
+        main_page, programs = build_site_pages(num_programs, seed)
+        self.pages = {"/": main_page, **programs}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description="Run benchmark mock servers")
+    parser.add_argument("server", choices=["llm", "site"])
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.2, help="LLM base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="LLM extra random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of LLM calls answered with 429")
+    parser.add_argument("--retry-after", type=int, default=None, help="Retry-After sent with simulated 429s")
+    args = parser.parse_args()
+
+    if args.server == "llm":
+        server = MockLLMServer(args.latency, args.jitter, args.error_rate, port=args.port,
+                               retry_after=args.retry_after)
+        logger.info(f"Mock LLM listening on {server.completions_url}")
+    else:
+        server = StubSiteServer(port=args.port)
+        logger.info(f"Stub site listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
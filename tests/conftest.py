@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT_DIR, "backend")
+for path in (ROOT_DIR, BACKEND_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from benchmarks.servers import MockLLMServer, StubSiteServer
+
+
+@pytest.fixture(scope="session")
+def mock_llm():
+    with MockLLMServer(latency=0.0) as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def stub_site():
+    with StubSiteServer() as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def offline_env(mock_llm, stub_site, tmp_path_factory):
+    """Point the backend at the local mock LLM, stub website and a temporary ChromaDB"""
+    env = {
+        "GROQ_API_KEY": "test",
+        "GROQ_API_URL": mock_llm.completions_url,
+        "SAN_BASE_URL": stub_site.url,
+        "CHROMA_DB_PATH": str(tmp_path_factory.mktemp("chroma_db")),
+    }
+    previous = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    yield env
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
@@ -0,0 +1,33 @@
+from answer_cache import AnswerCache
+
+
+def test_hit_requires_same_context():
+    cache = AnswerCache(max_size=10)
+    cache.put("Who teaches Databases?", "en", ["chunk a"], "Dr Smith")
+    # Query normalization ignores case and whitespace
+    assert cache.get("  who teaches   databases? ", "en", ["chunk a"]) == "Dr Smith"
+    assert cache.get("Who teaches Databases?", "pl", ["chunk a"]) is None
+    assert cache.get("Who teaches Databases?", "en", ["chunk b"]) is None
+    assert cache.metrics()["hits"] == 1
+    assert cache.metrics()["misses"] == 2
+
+def test_evicts_least_recently_used():
+    cache = AnswerCache(max_size=2)
+    cache.put("a", "en", [], "A")
+    cache.put("b", "en", [], "B")
+    cache.get("a", "en", [])
+    cache.put("c", "en", [], "C")
+    assert cache.get("b", "en", []) is None
+    assert cache.get("a", "en", []) == "A"
+    assert cache.get("c", "en", []) == "C"
+
+def test_entries_expire():
+    cache = AnswerCache(max_size=10, ttl=-1)
+    cache.put("a", "en", [], "A")
+    assert cache.get("a", "en", []) is None
+    assert cache.metrics()["size"] == 0
+
+def test_zero_size_disables_cache():
+    cache = AnswerCache(max_size=0)
+    cache.put("a", "en", [], "A")
+    assert cache.get("a", "en", []) is None
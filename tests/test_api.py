@@ -1,28 +1,136 @@
-import os
-import tempfile
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("chromadb")
+pytest.importorskip("sentence_transformers")
+
 from fastapi.testclient import TestClient
-from backend.main import app
-
-client = TestClient(app)
-
-def test_upload_pdf():
-    # Создаём временный PDF-файл
-    temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-    temp_pdf.write(b'%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\ntrailer\n<< /Root 1 0 R >>\n%%EOF')
-    temp_pdf.close()
-    with open(temp_pdf.name, "rb") as f:
-        response = client.post("/upload", files={"file": (os.path.basename(temp_pdf.name), f, "application/pdf")})
-    os.unlink(temp_pdf.name)
+from starlette.requests import Request
+
+from answer_cache import AnswerCache
+from benchmarks.fixtures import build_corpus
+from llm_scheduler import LLMScheduler
+
+
+@pytest.fixture(scope="module")
+def client(offline_env):
+    # main создаёт VectorStore при импорте, поэтому импортируем после настройки окружения
+    import main
+    return TestClient(main.app)
+
+@pytest.fixture(autouse=True)
+def empty_answer_cache(client, monkeypatch):
+    # Ответы из кэша обходят планировщик, поэтому каждый тест начинает с пустого кэша
+    import main
+    monkeypatch.setattr(main, "answer_cache", AnswerCache())
+
+def test_upload_pdf(client):
+    doc = build_corpus(1)[0]
+    response = client.post("/upload", files={"file": (doc["name"], doc["content"], doc["content_type"])})
     assert response.status_code == 200
     data = response.json()
-    assert "filename" in data
-    assert data["filename"].endswith(".pdf")
-    assert "status" in data and data["status"] == "added to vector store"
+    assert data["status"] == "success"
+    assert "chunks added to database" in data["message"]
 
-def test_chat():
+def test_chat(client):
     # Простой тест запроса к чату
-    response = client.post("/chat", json={"message": "Jakie są przedmioty na 1 semestrze?", "history": []})
+    response = client.post("/chat", json={"query": "Jakie są przedmioty na 1 semestrze?", "language": "pl"})
     assert response.status_code == 200
     data = response.json()
-    assert "response" in data
-    assert "sources" in data 
\ No newline at end of file
+    assert data["answer"]
+    assert data["sources"]
+
+def test_chat_rejects_unknown_language(client):
+    response = client.post("/chat", json={"query": "Was ist Informatik?", "language": "de"})
+    assert response.status_code == 400
+
+def test_chat_returns_503_when_llm_queue_full(client, monkeypatch):
+    import main
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=0)
+    # Единственный слот занят, а очередь нулевой длины
+    asyncio.run(scheduler.acquire("holder"))
+    monkeypatch.setattr(main, "llm_scheduler", scheduler)
+    response = client.post("/chat", json={"query": "Who teaches Databases?", "language": "en"})
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert scheduler.metrics()["rejected_queue_full"] == 1
+
+def test_chat_returns_429_when_client_queue_full(client, monkeypatch):
+    import main
+    monkeypatch.setattr(main, "TRUST_CLIENT_ID_HEADER", True)
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=10, max_queue_per_client=0)
+    asyncio.run(scheduler.acquire("holder"))
+    monkeypatch.setattr(main, "llm_scheduler", scheduler)
+    response = client.post(
+        "/chat",
+        json={"query": "Who teaches Databases?", "language": "en"},
+        headers={"X-Client-Id": "busy-client"}
+    )
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+def test_chat_maps_upstream_rate_limit_to_503(client, monkeypatch, mock_llm):
+    import main
+    scheduler = LLMScheduler(max_concurrency=1)
+    monkeypatch.setattr(main, "llm_scheduler", scheduler)
+    monkeypatch.setattr(mock_llm, "error_rate", 1.0)
+    monkeypatch.setattr(mock_llm, "retry_after", 7)
+    response = client.post("/chat", json={"query": "Who teaches Databases?", "language": "en"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+    metrics = scheduler.metrics()
+    assert metrics["failed"] == 1
+    assert metrics["in_flight"] == 0
+    # Отклонённые запросы тоже получают Retry-After от провайдера
+    assert scheduler.retry_after() >= 6
+
+def test_chat_llm_timeout_releases_slot(client, monkeypatch, mock_llm):
+    import main
+    scheduler = LLMScheduler(max_concurrency=1)
+    monkeypatch.setattr(main, "llm_scheduler", scheduler)
+    monkeypatch.setattr(main.vector_store, "llm_call_timeout", 0.1)
+    monkeypatch.setattr(mock_llm, "latency", 0.5)
+    response = client.post("/chat", json={"query": "Who teaches Databases?", "language": "en"})
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert scheduler.metrics()["in_flight"] == 0
+
+def test_cached_answer_skips_llm_scheduler(client, monkeypatch, mock_llm):
+    import main
+    query = {"query": "Who teaches Databases?", "language": "en"}
+    first = client.post("/chat", json=query)
+    assert first.status_code == 200
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=0)
+    asyncio.run(scheduler.acquire("holder"))
+    monkeypatch.setattr(main, "llm_scheduler", scheduler)
+    llm_calls = mock_llm.stats()["requests"]
+    second = client.post("/chat", json=query)
+    assert second.status_code == 200
+    assert second.json()["answer"] == first.json()["answer"]
+    assert mock_llm.stats()["requests"] == llm_calls
+    assert scheduler.metrics()["rejected_queue_full"] == 0
+
+def make_request(host, headers):
+    return Request({
+        "type": "http",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": (host, 12345),
+    })
+
+def test_client_id_header_is_opt_in(client, monkeypatch):
+    import main
+    request = make_request("10.0.0.5", {"X-Client-Id": "spoofed"})
+    assert main.get_client_id(request) == "10.0.0.5"
+    monkeypatch.setattr(main, "TRUST_CLIENT_ID_HEADER", True)
+    assert main.get_client_id(request) == "spoofed"
+
+def test_client_id_from_trusted_proxy(client, monkeypatch):
+    import main
+    monkeypatch.setattr(main, "TRUSTED_PROXIES", {"10.0.0.1", "10.0.0.2"})
+    headers = {"X-Forwarded-For": "6.6.6.6, 1.2.3.4, 10.0.0.2"}
+    # Левые адреса задаёт сам клиент, им нельзя доверять
+    assert main.get_client_id(make_request("10.0.0.1", headers)) == "1.2.3.4"
+    # X-Forwarded-For от недоверенного узла игнорируется
+    assert main.get_client_id(make_request("1.2.3.4", {"X-Forwarded-For": "6.6.6.6"})) == "1.2.3.4"
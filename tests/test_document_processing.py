@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("PyPDF2")
+pytest.importorskip("pandas")
+pytest.importorskip("bs4")
+
+from document_processing import detect_language
+
+
+def test_detect_language_polish():
+    assert detect_language("Jakie są przedmioty na 1 semestrze i kto je prowadzi?") == "pl"
+
+def test_detect_language_english():
+    assert detect_language("Who teaches Databases in semester 2 and how is it assessed?") == "en"
+
+def test_detect_language_defaults_to_polish():
+    # Bez słów kluczowych wybieramy polski, bo strona uczelni jest po polsku
+    assert detect_language("Databases 3 8 seminar") == "pl"
+    assert detect_language("") == "pl"
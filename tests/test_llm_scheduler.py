@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+from llm_scheduler import LLMScheduler, SchedulerRejected
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_caps_concurrency():
+    scheduler = LLMScheduler(max_concurrency=2, max_queue=10, max_queue_per_client=10)
+    active, peak = 0, 0
+
+    async def call(i):
+        nonlocal active, peak
+        async with scheduler.slot(f"client_{i}"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def main():
+        await asyncio.gather(*(call(i) for i in range(8)))
+
+    run(main())
+    assert peak == 2
+    metrics = scheduler.metrics()
+    assert metrics["admitted"] == 8
+    assert metrics["completed"] == 8
+    assert metrics["in_flight"] == 0
+    assert metrics["queue_depth"] == 0
+
+def test_round_robin_between_clients():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=10, max_queue_per_client=10)
+    order = []
+
+    async def call(client_id):
+        async with scheduler.slot(client_id):
+            order.append(client_id)
+            await asyncio.sleep(0)
+
+    async def main():
+        await scheduler.acquire("holder")
+        tasks = [asyncio.create_task(call(c)) for c in ["a", "a", "a", "b"]]
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+    run(main())
+    assert order == ["a", "b", "a", "a"]
+
+def test_sheds_when_client_queue_full():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=10, max_queue_per_client=1)
+
+    async def main():
+        await scheduler.acquire("holder")
+        waiting = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerRejected) as exc:
+            await scheduler.acquire("a")
+        # Other clients can still queue
+        other = asyncio.create_task(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        assert scheduler.metrics()["queue_depth"] == 2
+        waiting.cancel()
+        other.cancel()
+        return exc.value
+
+    error = run(main())
+    assert error.status_code == 429
+    assert error.retry_after >= 1
+
+def test_sheds_when_global_queue_full():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=1, max_queue_per_client=5)
+
+    async def main():
+        await scheduler.acquire("holder")
+        waiting = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerRejected) as exc:
+            await scheduler.acquire("b")
+        waiting.cancel()
+        return exc.value
+
+    error = run(main())
+    assert error.status_code == 503
+    assert scheduler.metrics()["rejected_queue_full"] == 1
+
+def test_queue_timeout():
+    scheduler = LLMScheduler(max_concurrency=1, queue_timeout=0.01)
+
+    async def main():
+        await scheduler.acquire("holder")
+        with pytest.raises(SchedulerRejected) as exc:
+            await scheduler.acquire("a")
+        return exc.value
+
+    error = run(main())
+    assert error.status_code == 503
+    assert error.reason == "timeout"
+    assert scheduler.metrics()["queue_depth"] == 0
+
+def test_cancelled_waiter_frees_its_place():
+    scheduler = LLMScheduler(max_concurrency=1)
+
+    async def main():
+        await scheduler.acquire("holder")
+        waiting = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert scheduler.metrics()["queue_depth"] == 0
+        scheduler.release()
+        # Slot is free again, so the next request is admitted without waiting
+        await asyncio.wait_for(scheduler.acquire("b"), timeout=1)
+
+    run(main())
+    assert scheduler.metrics()["in_flight"] == 1
+
+def test_failed_call_releases_slot_without_updating_service_time():
+    scheduler = LLMScheduler(max_concurrency=1)
+    before = scheduler.metrics()["service_time_ms"]
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            async with scheduler.slot("a"):
+                raise RuntimeError("upstream failed")
+
+    run(main())
+    metrics = scheduler.metrics()
+    assert metrics["in_flight"] == 0
+    assert metrics["failed"] == 1
+    assert metrics["service_time_ms"] == before
+
+def test_upstream_backoff_raises_retry_after():
+    scheduler = LLMScheduler(max_concurrency=1)
+    assert scheduler.retry_after() == 1
+    scheduler.note_upstream_backoff(30)
+    assert 29 <= scheduler.retry_after() <= 30
+
+def test_shed_is_logged(caplog):
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=0)
+
+    async def main():
+        await scheduler.acquire("holder")
+        with pytest.raises(SchedulerRejected):
+            await scheduler.acquire("noisy")
+
+    with caplog.at_level("WARNING", logger="llm_scheduler"):
+        run(main())
+    assert "noisy" in caplog.text
+    assert "queue_full" in caplog.text
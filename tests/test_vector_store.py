@@ -0,0 +1,101 @@
+import logging
+
+import pytest
+
+pytest.importorskip("chromadb")
+pytest.importorskip("sentence_transformers")
+
+from vector_store import VectorStore, hnsw_metadata_from_env
+
+POLISH_CHUNKS = [
+    "Przedmiot Bazy danych jest prowadzony na drugim semestrze i kończy się egzaminem.",
+    "Zajęcia z programowania odbywają się w laboratorium przez cały semestr.",
+]
+ENGLISH_CHUNK = "The Databases course is taught in the second semester and ends with an exam."
+UNRELATED_POLISH_CHUNK = "Stołówka jest czynna od poniedziałku do piątku, a parking dla gości znajduje się za budynkiem."
+
+
+@pytest.fixture
+def make_store(offline_env, tmp_path, monkeypatch):
+    """Create VectorStores sharing a fresh ChromaDB directory"""
+    monkeypatch.setenv("CHROMA_DB_PATH", str(tmp_path / "chroma_db"))
+
+    def factory(website: bool = True, **kwargs):
+        if not website:
+            monkeypatch.setattr(VectorStore, "_initialize_with_website_data", lambda self: None)
+        return VectorStore(**kwargs)
+    return factory
+
+def test_hnsw_metadata_defaults(monkeypatch):
+    for name in ("HNSW_SPACE", "HNSW_CONSTRUCTION_EF", "HNSW_SEARCH_EF", "HNSW_M", "HNSW_NUM_THREADS"):
+        monkeypatch.delenv(name, raising=False)
+    assert hnsw_metadata_from_env() == {"hnsw:space": "cosine"}
+
+def test_hnsw_metadata_from_env(monkeypatch):
+    monkeypatch.setenv("HNSW_SPACE", "l2")
+    monkeypatch.setenv("HNSW_M", "32")
+    monkeypatch.setenv("HNSW_SEARCH_EF", "100")
+    monkeypatch.setenv("HNSW_CONSTRUCTION_EF", "")
+    assert hnsw_metadata_from_env() == {"hnsw:space": "l2", "hnsw:M": 32, "hnsw:search_ef": 100}
+
+def test_reopen_with_different_m_warns(make_store, caplog):
+    make_store(hnsw_params={"hnsw:M": 16})
+    with caplog.at_level(logging.WARNING, logger="vector_store"):
+        store = make_store(hnsw_params={"hnsw:M": 32})
+    assert "different HNSW parameters (hnsw:M)" in caplog.text
+    # Stored metadata must still describe the index that is on disk
+    assert store.collections["default"].metadata["hnsw:M"] == 16
+
+def test_reopen_with_same_params_does_not_warn(make_store, caplog):
+    make_store(hnsw_params={"hnsw:M": 16})
+    with caplog.at_level(logging.WARNING, logger="vector_store"):
+        make_store(hnsw_params={"hnsw:M": 16})
+    assert "different HNSW parameters" not in caplog.text
+
+def test_language_layout_routes_chunks(make_store):
+    store = make_store(layout="language")
+    before = {key: collection.count() for key, collection in store.collections.items()}
+    # The stub website is mostly Polish with one English program page
+    assert before["pl"] > before["en"] > 0
+    store.add_documents(POLISH_CHUNKS + [ENGLISH_CHUNK])
+    assert store.collections["pl"].count() == before["pl"] + 2
+    assert store.collections["en"].count() == before["en"] + 1
+    assert store.count() == sum(before.values()) + 3
+    metadatas = store.collections["pl"].get(where={"source": "uploaded_document"})["metadatas"]
+    assert {metadata["language"] for metadata in metadatas} == {"pl"}
+
+def test_source_layout_routes_chunks(make_store):
+    store = make_store(layout="source")
+    assert store.collections["website"].count() > 0
+    store.add_documents(POLISH_CHUNKS)
+    assert store.collections["uploaded_document"].count() == 2
+
+def test_search_prefers_requested_language(make_store):
+    store = make_store(website=False, layout="language")
+    store.language_fallback_distance = 2.0
+    store.add_documents(POLISH_CHUNKS + [ENGLISH_CHUNK])
+    # The English chunk is the closest match, but Polish hits within the
+    # fallback distance must come first
+    results = store.search(ENGLISH_CHUNK, top_k=3, language="pl")
+    assert set(results[:2]) == set(POLISH_CHUNKS)
+    assert results[2] not in POLISH_CHUNKS
+
+def test_search_falls_back_to_other_languages(make_store):
+    store = make_store(website=False, layout="language")
+    assert store.collections["pl"].count() == 0
+    store.add_documents([ENGLISH_CHUNK])
+    assert store.search(ENGLISH_CHUNK, top_k=1, language="pl") == [ENGLISH_CHUNK]
+
+def test_search_falls_back_when_requested_language_is_distant(make_store):
+    store = make_store(website=False, layout="language")
+    store.add_documents([UNRELATED_POLISH_CHUNK, ENGLISH_CHUNK])
+    # There is a Polish hit, but it is unrelated to the question
+    assert store.search(ENGLISH_CHUNK, top_k=1, language="pl") == [ENGLISH_CHUNK]
+    assert store.search(ENGLISH_CHUNK, top_k=2, language="pl") == [ENGLISH_CHUNK, UNRELATED_POLISH_CHUNK]
+    assert store.language_fallbacks == 2
+
+def test_layout_change_warns_about_orphaned_documents(make_store, caplog):
+    make_store(layout="single").add_documents(POLISH_CHUNKS)
+    with caplog.at_level(logging.WARNING, logger="vector_store"):
+        make_store(layout="language")
+    assert "Collection 'documents'" in caplog.text